@@ -15,7 +15,8 @@ setup(
         "numpy",
         "matplotlib",
         "scipy",
-        "mplcursors"
+        "mplcursors",
+        "spglib>=2.5"
     ],
     entry_points={
         "console_scripts": [
@@ -1,9 +1,11 @@
 import argparse
 import os
 import json
+import hashlib
+from functools import lru_cache
 import numpy as np
+import spglib
 from pymatgen.core.structure import Structure
-from pymatgen.symmetry.analyzer import SpacegroupAnalyzer
 
 # 默认配置
 DEFAULT_CONFIG = {
@@ -36,86 +38,182 @@ def read_poscar(file_path):
         raise ValueError(f"Failed to read POSCAR file: {e}")
     return structure
 
+# 超过该原子数时改用 Gram 矩阵恒等式计算距离矩阵
+GRAM_MIN_ATOMS = 64
+
+def squared_distance_matrix(positions):
+    """计算所有原子间距离的平方矩阵（不开方，便于直接比较大小）"""
+    if len(positions) > GRAM_MIN_ATOMS:
+        # D² = |x_i|² + |x_j|² - 2 x_i·x_j，主要计算交给 BLAS 矩阵乘法
+        sq = np.einsum("ij,ij->i", positions, positions)
+        d2 = sq[:, None] + sq[None, :] - 2.0 * (positions @ positions.T)
+        np.fill_diagonal(d2, 0.0)
+        return np.maximum(d2, 0.0)
+    # 小体系直接广播
+    diff = positions[:, None, :] - positions[None, :, :]
+    return np.einsum("ijk,ijk->ij", diff, diff)
+
 def calculate_distances(structure):
     """计算所有原子对的距离，并按元素对分类"""
-    positions = structure.cart_coords
-    species = structure.species
+    positions = np.asarray(structure.cart_coords)
+    species = np.array([str(s) for s in structure.species])
     n_atoms = len(positions)
-    distances = {}
 
-    # 遍历所有原子对
-    for i in range(n_atoms):
-        for j in range(i + 1, n_atoms):  # 只考虑 i < j
-            distance = np.linalg.norm(positions[i] - positions[j])
-            pair = f"{species[i]}-{species[j]}"
-            atom_pair = f"{species[i]}{i+1}-{species[j]}{j+1}"
-            if pair not in distances:
-                distances[pair] = []
-            distances[pair].append((distance, atom_pair))  # 添加距离和原子对信息
-
-    # 对每一类距离排序
-    for pair in distances:
-        distances[pair].sort(key=lambda x: x[0])
+    # 计算距离平方矩阵，只取上三角（i < j）；排序和取最小值都在平方上进行
+    d2_matrix = squared_distance_matrix(positions)
+    i_idx, j_idx = np.triu_indices(n_atoms, k=1)
+    d2 = d2_matrix[i_idx, j_idx]
+
+    # 元素按首次出现的顺序编号，元素对编码为 a*K+b（a <= b）
+    uniq, first, inverse = np.unique(species, return_index=True, return_inverse=True)
+    appearance = np.argsort(first)
+    elements = uniq[appearance]
+    kinds = np.argsort(appearance)[inverse]
+    n_kinds = len(elements)
+    a = np.minimum(kinds[i_idx], kinds[j_idx])
+    b = np.maximum(kinds[i_idx], kinds[j_idx])
+    code = a * n_kinds + b
+
+    # 按元素对编码分组（无需对距离排序）
+    order = np.argsort(code, kind="stable")
+    code, d2 = code[order], d2[order]
+    i_idx, j_idx = i_idx[order], j_idx[order]
+    codes, starts = np.unique(code, return_index=True)
+
+    # 每组只取最小距离；并列时取组内第一个
+    distances = {}
+    if len(d2) == 0:
+        return distances
+    group_min = np.minimum.reduceat(d2, starts)
+    group_of = np.repeat(np.arange(len(codes)), np.diff(np.append(starts, len(d2))))
+    hits = np.flatnonzero(d2 == group_min[group_of])
+    winners = hits[np.unique(group_of[hits], return_index=True)[1]]
+
+    # 只对每组的最小值开方，并格式化对应的原子对
+    for c, min_distance, w in zip(codes, np.sqrt(group_min), winners):
+        i, j = i_idx[w], j_idx[w]
+        distances[f"{elements[c // n_kinds]}-{elements[c % n_kinds]}"] = (
+            min_distance, f"{species[i]}{i+1}-{species[j]}{j+1}"
+        )
 
     return distances
-def save_distances(distances, output_file):
+def format_distance_table(summary):
+    """将最小距离统计格式化为表格文本（标题行 + 每类一行）"""
+    lines = [
+        f"{'Rank':<8}{'Pair':<12}{'Min Distance (Å)':<20}{'Atom Pair':<20}",
+        "=" * 60
+    ]
+    lines.extend(
+        f"{rank:<8}{pair:<12}{stats['min']:<20.4f}{stats['atom_pair']:<20}"
+        for rank, (pair, stats) in enumerate(summary, start=1)
+    )
+    return "\n".join(lines) + "\n"
+
+def save_distances(summary, output_file):
     """将分类后的最小距离和原子对保存到文件"""
     with open(output_file, 'w') as f:
-        # 写入标题行
-        f.write(f"{'Rank':<8}{'Pair':<12}{'Min Distance (Å)':<20}{'Atom Pair':<20}\n")
-        f.write("=" * 60 + "\n")
-        summary = summarize_distances(distances)
-        for rank, (pair, stats) in enumerate(summary, start=1):
-            f.write(f"{rank:<8}{pair:<12}{stats['min']:<20.4f}{stats['atom_pair']:<20}\n")
+        f.write(format_distance_table(summary))
 
 
 
 def summarize_distances(distances):
     """生成每类距离的最小值及对应的原子对"""
-    summary = []
-    for key, value in distances.items():
-        min_distance = value[0][0]
-        min_atom_pair = value[0][1]
-        summary.append((key, {"min": min_distance, "atom_pair": min_atom_pair}))
-    # 按最小距离排序
-    return sorted(summary, key=lambda x: x[1]["min"])
+    summary = [
+        (key, {"min": min_distance, "atom_pair": min_atom_pair})
+        for key, (min_distance, min_atom_pair) in distances.items()
+    ]
+    # 按最小距离排序（一次稳定 argsort，并列时保持原顺序）
+    order = np.argsort([stats["min"] for _, stats in summary], kind="stable")
+    return [summary[k] for k in order]
+
+# 对称性分析结果的磁盘缓存目录
+SYMCACHE_DIR = ".symcache"
+
+def symmetry_cache_key(structure, tol):
+    """根据晶格、坐标、元素和容差生成缓存键"""
+    h = hashlib.sha1()
+    h.update(np.ascontiguousarray(structure.lattice.matrix, dtype=float).tobytes())
+    h.update(np.ascontiguousarray(structure.frac_coords, dtype=float).tobytes())
+    h.update(",".join(str(s) for s in structure.species).encode())
+    h.update(repr(float(tol)).encode())
+    return h.hexdigest()
+
+# 空间群编号上限与晶系的对应关系
+CRYSTAL_SYSTEMS = [
+    (2, "triclinic"),
+    (15, "monoclinic"),
+    (74, "orthorhombic"),
+    (142, "tetragonal"),
+    (167, "trigonal"),
+    (194, "hexagonal"),
+    (230, "cubic")
+]
+
+def crystal_system_from_number(number):
+    """根据空间群编号得到晶系"""
+    for upper, system in CRYSTAL_SYSTEMS:
+        if number <= upper:
+            return system
+    raise ValueError(f"Invalid space group number: {number}")
+
+@lru_cache(maxsize=128)
+def _analyze_cell(lattice, species, frac_coords, tol):
+    """对给定晶胞调用一次 spglib（同一进程内重复调用直接复用结果）"""
+    kinds = {s: n for n, s in enumerate(dict.fromkeys(species), start=1)}
+    cell = (np.array(lattice), np.array(frac_coords), [kinds[s] for s in species])
+    # angle_tolerance 与 pymatgen SpacegroupAnalyzer 的默认值一致
+    dataset = spglib.get_symmetry_dataset(cell, symprec=tol, angle_tolerance=5)
+    if dataset is None:
+        raise ValueError(spglib.get_error_message())
+    return {
+        "space_group_symbol": dataset.international,
+        "space_group_number": int(dataset.number),
+        "crystal_system": crystal_system_from_number(dataset.number),
+        "point_group": dataset.pointgroup
+    }
 
 def analyze_symmetry(structure, tol):
-    """使用 pymatgen 分析晶体对称性"""
+    """使用 spglib 分析晶体对称性，结果缓存到 .symcache/ 下"""
+    cache_file = os.path.join(SYMCACHE_DIR, f"{symmetry_cache_key(structure, tol)}.json")
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass  # 缓存损坏时重新分析
+
     try:
-        analyzer = SpacegroupAnalyzer(structure, symprec=tol)
-        space_group_symbol = analyzer.get_space_group_symbol()
-        space_group_number = analyzer.get_space_group_number()
-        crystal_system = analyzer.get_crystal_system()
-        point_group = analyzer.get_point_group_symbol()
-
-        return {
-            "space_group_symbol": space_group_symbol,
-            "space_group_number": space_group_number,
-            "crystal_system": crystal_system,
-            "point_group": point_group
-        }
+        symmetry_info = dict(_analyze_cell(
+            tuple(map(tuple, structure.lattice.matrix)),
+            tuple(str(s) for s in structure.species),
+            tuple(map(tuple, structure.frac_coords)),
+            float(tol)
+        ))
     except Exception as e:
         raise ValueError(f"Failed to analyze symmetry: {e}")
 
-def save_symmetry(symmetry_info, distances, output_file):
+    try:
+        os.makedirs(SYMCACHE_DIR, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump(symmetry_info, f, indent=4)
+    except OSError as e:
+        print(f"Warning: failed to write symmetry cache {cache_file}: {e}")
+    return symmetry_info
+
+def save_symmetry(symmetry_info, summary, output_file):
     """保存对称性和最小距离统计到文件"""
     with open(output_file, 'w') as f:
-        # 写入对称性信息
-        f.write("Symmetry Information:\n")
-        f.write(f"space_group_symbol: {symmetry_info['space_group_symbol']}\n")
-        f.write(f"space_group_number: {symmetry_info['space_group_number']}\n")
-        f.write(f"crystal_system: {symmetry_info['crystal_system']}\n")
-        f.write(f"point_group: {symmetry_info['point_group']}\n\n")
-
-        # 写入最小距离统计
-        f.write(f"{'Rank':<8}{'Pair':<12}{'Min Distance (Å)':<20}{'Atom Pair':<20}\n")
-        f.write("=" * 60 + "\n")
-        summary = summarize_distances(distances)
-        for rank, (pair, stats) in enumerate(summary, start=1):
-            f.write(f"{rank:<8}{pair:<12}{stats['min']:<20.4f}{stats['atom_pair']:<20}\n")
-
-def display_summary(symmetry_info, distances):
+        # 对称性信息和最小距离统计一次写入
+        f.write(
+            "Symmetry Information:\n"
+            f"space_group_symbol: {symmetry_info['space_group_symbol']}\n"
+            f"space_group_number: {symmetry_info['space_group_number']}\n"
+            f"crystal_system: {symmetry_info['crystal_system']}\n"
+            f"point_group: {symmetry_info['point_group']}\n\n"
+            + format_distance_table(summary)
+        )
+
+def display_summary(symmetry_info, summary):
     """在屏幕上显示对称性和最小距离统计"""
     print("\nSymmetry Information:")
     print(f"  space_group_symbol: {symmetry_info['space_group_symbol']}")
@@ -124,7 +222,6 @@ def display_summary(symmetry_info, distances):
     print(f"  point_group: {symmetry_info['point_group']}")
 
     print("\nTotal Distances:")
-    summary = summarize_distances(distances)
     for rank, (pair, stats) in enumerate(summary, start=1):
         print(f"  {rank:<3} {pair:<12} Min: {stats['min']:<10.4f} Pair: {stats['atom_pair']}")
 
@@ -159,18 +256,19 @@ def main():
 
     print("Calculating distances...")
     distances = calculate_distances(structure)
+    summary = summarize_distances(distances)
 
     print(f"Saving distances to {distance_file}...")
-    save_distances(distances, distance_file)
+    save_distances(summary, distance_file)
 
     print("Analyzing symmetry...")
     symmetry_info = analyze_symmetry(structure, tol)
 
     print(f"Saving symmetry information to {symmetry_file}...")
-    save_symmetry(symmetry_info, distances, symmetry_file)
+    save_symmetry(symmetry_info, summary, symmetry_file)
 
     print("Displaying summary...")
-    display_summary(symmetry_info, distances)
+    display_summary(symmetry_info, summary)
 
     print("Done!")
 
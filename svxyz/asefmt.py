@@ -1,6 +1,8 @@
 import argparse
 import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from ase.io import read as ase_read, write as ase_write
 
 # 默认配置
@@ -64,28 +66,51 @@ def convert_with_ase(input_file, output_file, input_format=None, output_format=N
     except Exception as e:
         print(f"Error with ASE: {e}")
 
+def convert_many(pairs, input_format=None, output_format=None, nproc=None):
+    """
+    批量转换文件格式，多个文件时分发到进程池并行转换。
+
+    Args:
+        pairs (list): (输入文件, 输出文件) 元组列表。
+        input_format (str, optional): 输入格式，None 表示由 ASE 自动识别。
+        output_format (str, optional): 输出格式，None 表示由 ASE 按输出文件名推断。
+        nproc (int, optional): 进程数，None 表示使用全部 CPU 核。
+    """
+    if len(pairs) == 1 or nproc == 1:
+        for input_file, output_file in pairs:
+            convert_with_ase(input_file, output_file, input_format, output_format)
+        return
+
+    input_files, output_files = zip(*pairs)
+    with ProcessPoolExecutor(max_workers=nproc) as executor:
+        list(executor.map(convert_with_ase, input_files, output_files,
+                          repeat(input_format), repeat(output_format)))
+
 def main():
     # 命令行参数解析
     parser = argparse.ArgumentParser(description="Convert material structure files using ASE.")
-    parser.add_argument("--i", required=True, help="Input file path")
-    parser.add_argument("--o", required=True, help="Output file path")
+    parser.add_argument("--i", required=True, nargs="+", help="Input file path(s)")
+    parser.add_argument("--o", required=True, nargs="+", help="Output file path(s), one per input file")
     parser.add_argument("--ifmt", default=None, help="Input file format (optional)")
     parser.add_argument("--ofmt", default=None, help="Output file format (optional)")
+    parser.add_argument("--nproc", type=int, default=None, help="Number of worker processes for batch conversion (default: all CPUs)")
     args = parser.parse_args()
 
+    if len(args.i) != len(args.o):
+        parser.error(f"--i and --o must list the same number of files ({len(args.i)} vs {len(args.o)}).")
+
     # 加载配置
     config_file = "asefmt.json"
     config = load_or_create_config(config_file)
 
     # 使用命令行参数覆盖配置
-    input_file = args.i or config["input_file"]
-    output_file = args.o or config["output_file"]
+    input_files = args.i or [config["input_file"]]
+    output_files = args.o or [config["output_file"]]
     input_format = args.ifmt or config["input_format"]
     output_format = args.ofmt or config["output_format"]
 
     # 转换文件格式
-    convert_with_ase(input_file, output_file, input_format, output_format)
+    convert_many(list(zip(input_files, output_files)), input_format, output_format, args.nproc)
 
 if __name__ == "__main__":
     main()
-
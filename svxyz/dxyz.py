@@ -1,95 +1,319 @@
 import sys
 import os
-import json
 import argparse
-from ase.io import read
+import mmap
+import zipfile
+from io import BytesIO, StringIO
+from concurrent.futures import ProcessPoolExecutor
+from ase.io import iread
+from ase.io.formats import filetype
+from ase.io.extxyz import key_val_str_to_dict, parse_properties
 import numpy as np
 
-def extract_properties_with_ids(xyz_file):
+from svxyz.jsonio import dump_json, load_json
+from svxyz.xyzscan import frame_headers, file_signature
+
+# 每帧数值数据的结构化类型（固定形状：6 个 fstress 分量和 6 个 ASE 应力分量）
+FRAME_DTYPE = np.dtype([
+    ("energy", "f8"),
+    ("max_force", "f8"),
+    ("mean_force", "f8"),
+    ("stress", "f8", (6,)),
+    ("stress_voigt", "f8", (6,)),
+    ("volume", "f8")
+])
+
+# 各输出文件的行格式和标题（整行格式串预先拼好，列宽与标题对齐）
+E_FMT = "%-20.6f%-10d"
+E_HEADER = f"{'Energy(eV)':<20}{'System_ID':<10}"
+F_FMT = "%-20.6f%-20.6f%-10d"
+F_HEADER = f"{'Max_Force':<20}{'Mean_Force':<20}{'System_ID':<10}"
+VIRIAL_FMT = "%-18.6f%-18.6f%-18.6f%-18.6f%-18.6f%-18.6f %-10d"
+VIRIAL_HEADER = f"{'V_xx':<18}{'V_yy':<18}{'V_zz':<18}{'V_yz':<18}{'V_xz':<18}{'V_xy':<18}{'System_ID':<10}"
+STRESS_FMT = "%-18.6f%-18.6f%-18.6f%-18.6f%-18.6f%-18.6f%-10d"
+STRESS_HEADER = f"{'S_xx':<18}{'S_yy':<18}{'S_zz':<18}{'S_yz':<18}{'S_xz':<18}{'S_xy':<18}{'System_ID':<10}"
+
+def frame_row(i, energy, forces, info, stress_voigt, volume):
+    """
+    由单帧的能量、力、info、ASE 应力和体积整理出一行结果（process_frame 和 scan_extxyz 共用）。
+
+    Returns:
+        tuple: (energy, max_force, mean_force, stress_values, stress_voigt, volume,
+                temperature, pressure, mindistance, min_pair)
+    """
+    if energy is None:
+        raise ValueError(f"Frame {i} is missing 'energy' in atoms.info.")
+
+    # 提取力范数（einsum 一次求各原子 |F|²，再开方，平均值需要逐原子的范数）
+    force_norms = np.sqrt(np.einsum("ij,ij->i", forces, forces))
+
+    # 提取应力
+    stress = info.get("fstress", None)
+    if stress is None:
+        raise ValueError(f"Frame {i} is missing 'fstress' in atoms.info.")
+
+    # 处理应力（fstress），字符串直接在 C 层解析为 float64 数组
+    if isinstance(stress, str):
+        stress_values = np.fromstring(stress, sep=",", dtype=np.float64)
+    elif isinstance(stress, (list, np.ndarray)):
+        stress_values = np.asarray(stress, dtype=np.float64)
+    else:
+        raise TypeError(f"Unsupported type for 'fstress': {type(stress)} in frame {i}")
+
+    return (
+        energy, force_norms.max(), force_norms.mean(), stress_values[:6], stress_voigt, volume,
+        info.get("temperature", "N/A"), info.get("pressure", "N/A"),
+        info.get("mindistance"), info.get("min_pair", "N/A")
+    )
+
+def process_frame(i, atoms):
+    """
+    提取单帧的能量、力范数、应力、virial 以及温度、压力等额外信息。
+
+    Args:
+        i (int): 帧编号，仅用于错误信息。
+        atoms (ase.Atoms): 当前帧。
+
+    Returns:
+        tuple: 见 frame_row。
+    """
+    # virial 所需的 ASE 应力（不含电子动能项）和体积在所有帧汇总后统一计算 virial
+    return frame_row(
+        i, atoms.get_potential_energy(), atoms.get_forces(), atoms.info,
+        atoms.get_stress(voigt=True), atoms.get_volume()
+    )
+
+def _force_columns(properties):
+    """由 extxyz 的 Properties 字符串得到 forces 所在的列号"""
+    columns, names = parse_properties(properties)[:2]
+    col = 0
+    for name in names:
+        ase_name, n_cols = columns[name]
+        if ase_name == "forces":
+            return list(range(col, col + n_cols))
+        col += n_cols
+    raise ValueError("Properties does not contain forces.")
+
+def scan_extxyz(xyz_file, start=0, stop=None, first_id=0):
+    """
+    不经过 ase.Atoms，直接从内存映射的 extxyz 文件中取出每帧所需的数值。
+
+    注释行用 ASE 的 key_val_str_to_dict 解析（与 iread 得到的 info 完全一致），
+    原子行只用 np.loadtxt 读取 forces 列，不解析元素和坐标、不创建 Atoms 和计算器对象。
+    遇到不符合预期的帧时抛出异常，由调用方退回到 ASE 读取。
+
+    Args:
+        xyz_file (str): 输入的 extxyz 文件路径。
+        start, stop (int): 读取的字节区间 [start, stop)，stop 为 None 时读到文件末尾。
+        first_id (int): 区间内第一帧的编号。
+
+    Returns:
+        list: 每帧一个 frame_row 结果。
+    """
+    rows = []
+    with open(xyz_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        stop = len(mm) if stop is None else stop
+        mm.seek(start)
+        i = first_id
+        while mm.tell() < stop:
+            line = mm.readline()
+            if not line.strip():
+                continue
+            n_atoms = int(line)
+            info = key_val_str_to_dict(mm.readline().decode().strip())
+            block_start = mm.tell()
+            for _ in range(n_atoms):
+                mm.readline()
+            forces = np.loadtxt(BytesIO(mm[block_start:mm.tell()]), usecols=_force_columns(info["Properties"]), ndmin=2)
+            if forces.shape != (n_atoms, 3):
+                raise ValueError(f"Frame {i} has malformed atom lines.")
+
+            # 与 ASE 相同：stress 为 3x3 时取 Voigt 分量 (xx, yy, zz, yz, xz, xy)；ASE 的 cell 是 Lattice 的转置
+            stress = np.asarray(info["stress"], dtype=float)
+            if stress.shape == (3, 3):
+                stress = stress[[0, 1, 2, 1, 0, 0], [0, 1, 2, 2, 2, 1]]
+            volume = abs(np.linalg.det(info["Lattice"].T))
+
+            rows.append(frame_row(i, info["energy"], forces, info, stress, volume))
+            i += 1
+    return rows
+
+def _cache_path(xyz_file):
+    """返回 XYZ 文件对应的数值缓存文件路径（与输入文件放在一起）"""
+    return f"{xyz_file}.svxyz-cache.npz"
+
+# 缓存格式版本；FRAME_DTYPE 或 extras 的布局改变时必须递增，使旧缓存失效
+CACHE_VERSION = "1"
+
+def _file_signature(xyz_file):
+    """用缓存格式版本、绝对路径、修改时间和文件大小标识输入文件的当前版本"""
+    mtime_ns, size = file_signature(xyz_file)
+    return np.array([CACHE_VERSION, os.path.abspath(xyz_file), str(mtime_ns), str(size)])
+
+def load_cache(xyz_file):
+    """
+    读取与输入文件匹配的缓存。
+
+    Returns:
+        tuple or None: (data, extras, has_mindistance)；缓存不存在、已过期或损坏时返回 None。
+    """
+    cache_file = _cache_path(xyz_file)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with np.load(cache_file) as cache:
+            if not np.array_equal(cache["signature"], _file_signature(xyz_file)):
+                return None
+            return cache["data"], cache["extras"], bool(cache["has_mindistance"])
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return None  # 缓存损坏（如写入中断留下的不完整文件）时重新解析
+
+def save_cache(xyz_file, data, extras, has_mindistance):
+    """将解析结果写入缓存，写入失败只给出警告"""
+    cache_file = _cache_path(xyz_file)
+    # 先写到同目录下的临时文件再替换，中断或磁盘写满时不会留下不完整的缓存
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_file, "wb") as f:
+            np.savez(f, signature=_file_signature(xyz_file), data=data,
+                     extras=extras, has_mindistance=has_mindistance)
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: failed to write cache {cache_file}: {e}")
+    finally:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+def frame_offsets(xyz_file):
+    """
+    找出 XYZ 文件每帧起始行（原子数行）的字节偏移。
+
+    Returns:
+        list: 各帧起始偏移，最后再附加文件末尾偏移，便于按区间切分。
+    """
+    offsets = [offset for offset, _ in frame_headers(xyz_file)]
+    # 扫描会消耗文件的每一行，最后一帧的结束位置即文件末尾
+    offsets.append(os.path.getsize(xyz_file))
+    return offsets
+
+def rows_to_arrays(rows):
+    """将 process_frame 的结果汇总为 (data, extras, has_mindistance)"""
+    # 检查是否存在 `mindistance` 信息
+    has_mindistance = any(row[8] is not None for row in rows)
+
+    # 数值部分汇总到一个结构化数组，额外信息按写出时的文本保存
+    data = np.empty(len(rows), dtype=FRAME_DTYPE)
+    extras = []
+    for i, row in enumerate(rows):
+        data[i] = row[:6]
+        temperature, pressure, mindistance, min_pair = row[6:]
+        mindistance = "N/A" if mindistance is None else mindistance
+        extras.append([str(temperature), str(pressure), str(mindistance), str(min_pair)])
+
+    return data, np.array(extras, dtype=str).reshape(len(rows), 4), has_mindistance
+
+def _extract_chunk(xyz_file, start, stop, first_id):
+    """在子进程中读取 [start, stop) 字节区间内的帧并逐帧提取"""
+    try:
+        return rows_to_arrays(scan_extxyz(xyz_file, start, stop, first_id))
+    except Exception:
+        pass  # 快速解析失败时改用 ASE 读取这一段
+    with open(xyz_file, "rb") as f:
+        f.seek(start)
+        text = f.read(stop - start).decode()
+    frames = iread(StringIO(text), index=":", format="extxyz")
+    return rows_to_arrays([process_frame(first_id + k, atoms) for k, atoms in enumerate(frames)])
+
+def read_frames(xyz_file, nproc=1):
+    """
+    逐帧解析 XYZ 文件。
+
+    Args:
+        xyz_file (str): 输入的 XYZ 文件路径。
+        nproc (int): 并行解析的进程数，1 表示不使用进程池。extxyz 文件按帧的字节偏移切分为
+            nproc 段，每个进程独立读取并解析自己的一段；其他格式（如 vasprun.xml）只能单进程读取。
+
+    Returns:
+        tuple: (data, extras, has_mindistance)。data 为 FRAME_DTYPE 结构化数组；
+               extras 为 (n_frames, 4) 的字符串数组，依次是温度、压力、最小距离和原子对。
+    """
+    if nproc > 1 and filetype(xyz_file) == "extxyz":
+        offsets = frame_offsets(xyz_file)
+        bounds = [int(b[0]) for b in np.array_split(np.arange(len(offsets) - 1), nproc) if len(b)]
+        bounds.append(len(offsets) - 1)
+        starts, stops = bounds[:-1], bounds[1:]
+        with ProcessPoolExecutor(max_workers=nproc) as executor:
+            chunks = list(executor.map(
+                _extract_chunk, [xyz_file] * len(starts),
+                [offsets[a] for a in starts], [offsets[b] for b in stops], starts
+            ))
+        if chunks:
+            data, extras, flags = zip(*chunks)
+            return np.concatenate(data), np.concatenate(extras), any(flags)
+
+    # extxyz 先尝试快速解析，失败时（格式不符、缺少字段等）改用 ASE 逐帧读取
+    if filetype(xyz_file) == "extxyz":
+        try:
+            return rows_to_arrays(scan_extxyz(xyz_file))
+        except Exception:
+            pass
+
+    # 逐帧流式读取，内存中不保留整条轨迹
+    frames = iread(xyz_file, index=":")
+    return rows_to_arrays([process_frame(i, atoms) for i, atoms in enumerate(frames)])
+
+def extract_properties_with_ids(xyz_file, nproc=1, mindistance="auto"):
     """
     从包含信息的 XYZ 文件中提取能量、力、virial、应力、温度、压力和体积数据，
     分别写入 E.dat, F.dat, virial.dat, stress.dat 和 extra_info.dat。
 
+    解析结果缓存在 `<xyz_file>.svxyz-cache.npz` 中，输入文件未改动时直接读取缓存。
+
     Args:
         xyz_file (str): 输入的 XYZ 文件路径。
+        nproc (int): 并行解析的进程数，1 表示不使用进程池。
+        mindistance (str or bool): extra_info.dat 是否包含最小距离列。"auto" 表示根据帧信息自动判断，
+            true/false 直接指定，跳过检测。
     """
     try:
-        # 加载所有帧
-        atoms_list = read(xyz_file, index=":")
-
-        # 检查是否存在 `mindistance` 信息
-        has_mindistance = any("mindistance" in atoms.info for atoms in atoms_list)
-
-        # 打开输出文件
-        with open("E.dat", "w") as e_file, \
-             open("F.dat", "w") as f_file, \
-             open("virial.dat", "w") as vir_file, \
-             open("stress.dat", "w") as stress_file, \
-             open("extra_info.dat", "w") as extra_file:
-
-            # 写入标题行
-            e_file.write(f"{'Energy(eV)':<20}{'System_ID':<10}\n")
-            f_file.write(f"{'Max_Force':<20}{'Mean_Force':<20}{'System_ID':<10}\n")
-            vir_file.write(f"{'V_xx':<18}{'V_yy':<18}{'V_zz':<18}{'V_yz':<18}{'V_xz':<18}{'V_xy':<18}{'System_ID':<10}\n")
-            stress_file.write(f"{'S_xx':<18}{'S_yy':<18}{'S_zz':<18}{'S_yz':<18}{'S_xz':<18}{'S_xy':<18}{'System_ID':<10}\n")
-
-            # 根据是否有 `mindistance` 信息写入标题行
-            if has_mindistance:
-                extra_file.write(f"{'Temperature(K)':<16}{'Pressure(GPa)':<15}{'Volume(Å³)':<15}{'Min_Distance(Å)':<18}{'Atom_Pair':<15}{'System_ID':<10}\n")
-            else:
-                extra_file.write(f"{'Temperature(K)':<16}{'Pressure(GPa)':<15}{'Volume(Å³)':<15}{'System_ID':<10}\n")
-
-            # 遍历每一帧
-            for i, atoms in enumerate(atoms_list):
-                # 提取能量
-                energy = atoms.get_potential_energy()
-                if energy is None:
-                    raise ValueError(f"Frame {i} is missing 'energy' in atoms.info.")
-                e_file.write(f"{energy:<20.6f}{i:<10}\n")
-
-                # 提取力范数
-                forces = atoms.get_forces()
-                mean_force_norm = np.linalg.norm(forces, axis=1).mean()  # 平均力范数
-                max_force_norm = np.linalg.norm(forces, axis=1).max()  # 最大力范数
-                f_file.write(f"{max_force_norm:<20.6f}{mean_force_norm:<20.6f}{i:<10}\n")
-
-                # 提取应力
-                stress = atoms.info.get("fstress", None)
-                if stress is None:
-                    raise ValueError(f"Frame {i} is missing 'fstress' in atoms.info.")
-
-                # 处理应力（fstress）
-                if isinstance(stress, str):
-                    stress_values = list(map(float, stress.split(", ")))
-                elif isinstance(stress, (list, np.ndarray)):
-                    stress_values = list(map(float, stress))
-                else:
-                    raise TypeError(f"Unsupported type for 'fstress': {type(stress)} in frame {i}")
-
-                # 写入应力（fstress）
-                stress_file.write(f"{stress_values[0]:<18.6f}{stress_values[1]:<18.6f}{stress_values[2]:<18.6f}"
-                                  f"{stress_values[3]:<18.6f}{stress_values[4]:<18.6f}{stress_values[5]:<18.6f}{i:<10}\n")
-
-                # 计算 virial
-                stress_voigt = atoms.get_stress(voigt=True)  # ASE 应力（不含电子动能项）
-                volume = atoms.get_volume()
-                virial = [-s * volume for s in stress_voigt]  # Virial = -stress * volume
-
-                # 写入 virial
-                vir_file.write(f"{virial[0]:<18.6f}{virial[1]:<18.6f}{virial[2]:<18.6f}"
-                               f"{virial[3]:<18.6f}{virial[4]:<18.6f}{virial[5]:<18.6f} {i:<10}\n")
-
-                # 提取额外信息：温度、压力和体积
-                temperature = atoms.info.get("temperature", "N/A")
-                pressure = atoms.info.get("pressure", "N/A")
-
-                # 写入 `extra_info.dat`，根据是否有 `mindistance` 动态调整列
-                if has_mindistance:
-                    mindistance = atoms.info.get("mindistance", "N/A")
-                    min_pair = atoms.info.get("min_pair", "N/A")
-                    extra_file.write(f"{temperature:<16}{pressure:<15}{volume:<15.6f}{mindistance:<18}{min_pair:<15}{i:<10}\n")
-                else:
-                    extra_file.write(f"{temperature:<16}{pressure:<15}{volume:<15.6f}{i:<10}\n")
+        cached = load_cache(xyz_file)
+        if cached is not None:
+            print(f"使用缓存 {_cache_path(xyz_file)}。")
+            data, extras, has_mindistance = cached
+        else:
+            data, extras, has_mindistance = read_frames(xyz_file, nproc)
+            save_cache(xyz_file, data, extras, has_mindistance)
+        if mindistance != "auto":
+            has_mindistance = bool(mindistance)
+
+        n_frames = len(data)
+        system_ids = np.arange(n_frames)
+
+        # 根据是否有 `mindistance` 信息动态调整列，所有行拼接后一次写入
+        if has_mindistance:
+            lines = [f"{'Temperature(K)':<16}{'Pressure(GPa)':<15}{'Volume(Å³)':<15}{'Min_Distance(Å)':<18}{'Atom_Pair':<15}{'System_ID':<10}"]
+            lines.extend(
+                f"{temperature:<16}{pressure:<15}{volume:<15.6f}{mindistance:<18}{min_pair:<15}{i:<10}"
+                for i, (volume, (temperature, pressure, mindistance, min_pair)) in enumerate(zip(data["volume"], extras))
+            )
+        else:
+            lines = [f"{'Temperature(K)':<16}{'Pressure(GPa)':<15}{'Volume(Å³)':<15}{'System_ID':<10}"]
+            lines.extend(
+                f"{temperature:<16}{pressure:<15}{volume:<15.6f}{i:<10}"
+                for i, (volume, (temperature, pressure, _, _)) in enumerate(zip(data["volume"], extras))
+            )
+        with open("extra_info.dat", "w") as extra_file:
+            extra_file.write("\n".join(lines) + "\n")
+
+        # Virial = -stress * volume，对所有帧一次向量化计算，直接写入预分配的数组
+        virials = np.empty((n_frames, 6))
+        np.multiply(data["stress_voigt"], -data["volume"][:, None], out=virials)
+
+        # 一次性写出能量、力、应力和 virial（每个文件一次 savetxt）
+        np.savetxt("E.dat", np.column_stack([data["energy"], system_ids]), fmt=E_FMT, header=E_HEADER, comments="")
+        np.savetxt("F.dat", np.column_stack([data["max_force"], data["mean_force"], system_ids]), fmt=F_FMT, header=F_HEADER, comments="")
+        np.savetxt("virial.dat", np.column_stack([virials, system_ids]), fmt=VIRIAL_FMT, header=VIRIAL_HEADER, comments="")
+        np.savetxt("stress.dat", np.column_stack([data["stress"], system_ids]), fmt=STRESS_FMT, header=STRESS_HEADER, comments="")
 
         print("数据已成功写入 E.dat, F.dat, virial.dat, stress.dat 和 extra_info.dat。")
 
@@ -103,7 +327,8 @@ def main():
             "Usage:\n"
             "  dxyz [INPUT_FILE] \n  Note: If the input_file is not specified in the command line, the script will attempt to load it from txyz.json. If txyz.json is not found, a default txyz.json will be generated. Command line arguments will override settings in the JSON file.\n\n"
             "Options:\n"
-            "  -h, --help        Show this help message and exit.\n\n"
+            "  -h, --help        Show this help message and exit.\n"
+            "  -n, --nproc N     Number of worker processes used to parse frames (default: 1).\n\n"
             "Description:\n"
             "  This tool processes an XYZ file with embedded property information (e.g., energy, forces, virial, stress,\n"
             "  temperature, pressure, volume). It writes extracted data into separate `.dat` files:\n"
@@ -124,7 +349,9 @@ def main():
             "  The tool supports optional configuration via a `dxyz.json` file. If the file is absent,\n"
             "  it will be created with default values. The input XYZ file can also be specified in the JSON file.\n\n"
             "Configuration Keys:\n"
-            "  - xyz_file: Path to the input XYZ file."
+            "  - xyz_file: Path to the input XYZ file.\n"
+            "  - mindistance: \"auto\" (default) detects the mindistance columns from the frames;\n"
+            "                 true/false always includes/omits them in `extra_info.dat`."
         ),
         formatter_class=argparse.RawTextHelpFormatter  # 保证换行符正常显示
     )
@@ -133,6 +360,13 @@ def main():
         "input_file",
         help="Input XYZ file path."
     )   
+
+    parser.add_argument(
+        "-n", "--nproc",
+        type=int,
+        default=1,
+        help="Number of worker processes used to parse frames (default: 1)."
+    )
         
     args = parser.parse_args()
         
@@ -145,26 +379,41 @@ def main():
 
     # 如果有命令行参数，则保存到 JSON 文件
     if len(sys.argv) > 1:
-        xyz_file = sys.argv[1]
+        xyz_file = args.input_file
+
+        # 保留已有配置中的其他参数（如 mindistance），只更新输入文件
+        config = {"xyz_file": xyz_file, "mindistance": "auto"}
+        if os.path.exists(config_file):
+            # 已有配置损坏或不是 JSON 对象时只给出警告，按默认配置覆盖，不影响本次运行
+            try:
+                with open(config_file, "r") as f:
+                    existing = load_json(f)
+            except (OSError, ValueError) as e:
+                existing = None
+                print(f"Warning: ignoring unreadable {config_file}: {e}")
+            if isinstance(existing, dict):
+                config.update({k: v for k, v in existing.items() if k != "xyz_file"})
+            elif existing is not None:
+                print(f"Warning: ignoring {config_file}: expected a JSON object")
 
         # 保存参数到 JSON 文件
         with open(config_file, "w") as f:
-            json.dump({"xyz_file": xyz_file}, f, indent=4)
+            dump_json(config, f)
         print(f"参数已保存到 {config_file}。")
 
         # 执行提取
-        extract_properties_with_ids(xyz_file)
+        extract_properties_with_ids(xyz_file, args.nproc, config["mindistance"])
 
     # 如果没有命令行参数，则读取 JSON 文件
     else:
         if os.path.exists(config_file):
             with open(config_file, "r") as f:
-                config = json.load(f)
+                config = load_json(f)
                 xyz_file = config.get("xyz_file")
 
                 if xyz_file:
                     # 执行提取
-                    extract_properties_with_ids(xyz_file)
+                    extract_properties_with_ids(xyz_file, mindistance=config.get("mindistance", "auto"))
                 else:
                     print("配置文件中没有找到 'xyz_file' 参数。")
         else:
@@ -0,0 +1,14 @@
+import json
+
+try:
+    import orjson  # 可选依赖，仅用于读取；未安装时使用标准库 json
+except ImportError:
+    orjson = None
+
+def dump_json(obj, f):
+    """写出 JSON 配置（始终用标准库 json、缩进为 4，输出格式与是否安装 orjson 无关）"""
+    json.dump(obj, f, indent=4)
+
+def load_json(f):
+    """读入 JSON 配置，orjson 可用时用其解析"""
+    return orjson.loads(f.read()) if orjson is not None else json.load(f)
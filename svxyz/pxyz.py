@@ -51,29 +51,26 @@ def load_data(file, indices, data_type):
         data_type (str): 数据类型。
 
     Returns:
-        tuple: 数据矩阵 (list of curves), System_ID 列表, 和曲线标题（可选）。
+        tuple: 数据矩阵（曲线列表，infile 模式下为 NaN 填充对齐的二维数组）, System_ID 列表, 和曲线标题（可选）。
     """
     if data_type == "infile":
         # 读取 infile.dat 文件
         with open(file, "r") as f:
-            data = [line.split() for line in f.readlines()]
-        
-        # 提取标题和数值部分
-        #titles = [row[0] for row in data]  # 第一列为标题
-        titles = [row[0].replace("\\\\", "\\") for row in data] 
-        values = [list(map(float, row[1:])) for row in data]  # 其余列为数值数据
-        
+            data = [line.split() for line in f]
+
         # 检查索引范围
-        if max(indices) >= len(values):
-            raise IndexError(f"Index {max(indices)} is out of bounds for data with {len(values)} curves.")
+        if max(indices) >= len(data):
+            raise IndexError(f"Index {max(indices)} is out of bounds for data with {len(data)} curves.")
 
-        # 根据 indices 选择曲线数据
-        curves = [values[i] for i in indices]
-        selected_titles = [titles[i] for i in indices]  # 同时选择对应的标题
+        # 只转换选中的曲线：第一列为标题，其余列为数值数据
+        curves = [np.array(data[i][1:], dtype=np.float64) for i in indices]
+        selected_titles = [data[i][0].replace("\\\\", "\\") for i in indices]
         
-        # 对齐曲线长度（填充 NaN 以对齐）
+        # 对齐曲线长度：一次分配 NaN 填充的二维数组，再逐行拷入
         max_length = max(len(curve) for curve in curves)
-        aligned_curves = [curve + [np.nan] * (max_length - len(curve)) for curve in curves]
+        aligned_curves = np.full((len(curves), max_length), np.nan)
+        for i, curve in enumerate(curves):
+            aligned_curves[i, :len(curve)] = curve
         
         # 定义 System_ID 列表
         system_ids = list(range(max_length))
@@ -82,9 +79,9 @@ def load_data(file, indices, data_type):
         return aligned_curves, system_ids, selected_titles
 
     else:
-        # 处理其他数据类型（如 E.dat 等）
-        data = np.loadtxt(file, skiprows=1)
-        curves = [data[:, i] for i in indices]
+        # 处理其他数据类型（如 E.dat 等），只解析选中的列和最后的 System_ID 列
+        data = np.loadtxt(file, skiprows=1, usecols=(*indices, -1), ndmin=2)
+        curves = [data[:, k] for k in range(len(indices))]
         system_ids = data[:, -1].astype(int)
         titles = None
         return curves, system_ids, titles
@@ -92,7 +89,7 @@ def load_data(file, indices, data_type):
 
 
 
-def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=None, config=None,  indices=None):
+def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=None, config=None,  indices=None, ax1=None, ax2=None):
     """
     绘制分布图和投影图。
 
@@ -103,20 +100,27 @@ def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=
         labels (list): 每列的标识信息。
         titles (list, optional): 曲线标题，仅在 infile 模式下使用。
         config (dict): 配置字典。
+        indices (list, optional): 选择的列索引，用于生成图例标签。
+        ax1, ax2 (matplotlib.axes.Axes, optional): 分布图和投影图所用的坐标轴。
+            同时给出时直接绘制到调用者的图上（可在一张图中复用多组坐标轴），
+            布局、显示和保存由调用者负责；否则新建 1x2 的图。
     """
-    fig, axes = plt.subplots(1, 2, figsize=(12, 6))
+    own_figure = ax1 is None or ax2 is None
+    if own_figure:
+        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
 
-    # 左图：分布曲线
-    ax1 = axes[0]
-    for i, curve in enumerate(curves):
-        curve_array = np.array(curve)
-        curve_array = curve_array[~np.isnan(curve_array)]
+    # 去除 NaN 填充只做一次，左右两图共用
+    filtered = [np.asarray(curve)[~np.isnan(curve)] for curve in curves]
 
+    # 左图：分布曲线
+    for i, curve_array in enumerate(filtered):
+        # KDE 只在 1000 个网格点上求值一次，数据点处的密度由网格插值得到
         kde = gaussian_kde(curve_array)
         x = np.linspace(curve_array.min(), curve_array.max(), 1000)
+        density = kde(x)
 
         mean = np.mean(curve_array)
-        peak_x = x[np.argmax(kde(x))]
+        peak_x = x[np.argmax(density)]
         std_dev = np.std(curve_array)
 
         color = f"C{i}" if len(curves) > 1 else "blue"
@@ -132,7 +136,7 @@ def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=
 
 
 
-        line, = ax1.plot(x, kde(x), label=legend_label, color=color, linewidth=1.5)
+        line, = ax1.plot(x, density, label=legend_label, color=color, linewidth=1.5)
 
         cursor = mplcursors.cursor(line, hover=True)
         cursor.connect(
@@ -149,7 +153,7 @@ def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=
         )
 
         ax1.scatter(
-            curve_array, kde(curve_array),
+            curve_array, np.interp(curve_array, x, density),
             c=curve_array, cmap=config.get("cmap", "viridis"),
             edgecolor="black" if len(curves) == 1 else color,
             alpha=1.0,
@@ -167,11 +171,7 @@ def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=
     ax1.legend()
 
     # 右图：投影图
-    ax2 = axes[1]
-    for i, curve in enumerate(curves):
-        curve_array = np.array(curve)
-        curve_array = curve_array[~np.isnan(curve_array)]
-
+    for i, curve_array in enumerate(filtered):
         scatter = ax2.scatter(
             system_ids[:len(curve_array)], curve_array,
             c=curve_array, cmap=config.get("cmap", "viridis"),
@@ -208,6 +208,9 @@ def plot_distribution_and_projection(curves, system_ids, ylabel, labels, titles=
     if len(curves) == 1:
         plt.colorbar(scatter, ax=ax2, label=ylabel)
 
+    if not own_figure:
+        return
+
     plt.tight_layout()
     if config["show"]:
         plt.show()
@@ -1,17 +1,26 @@
 import os
 import re
-import json
+import mmap
 import sys
 import argparse
+from types import MappingProxyType
 import numpy as np
 from glob import glob
-from ase.io import read, write
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from scipy.spatial import cKDTree
+from scipy.spatial.distance import pdist
+from ase.io import iread, write
+from ase.io.formats import filetype, get_ioformat, open_with_compression
+
+from svxyz.jsonio import dump_json, load_json
 
 # 常量: 从 eV/Å³ 转换为 GPa
 EV_A3_TO_GPA = 160.21766208
 
-# 默认配置文件内容
-DEFAULT_CONFIG = {
+# 默认配置文件内容（只读，写出时转换为 dict）
+DEFAULT_CONFIG = MappingProxyType({
     "input_files": ["vasprun.xml"],
     "input_format": "vasp-xml",
     "output_file": "filtered_output.xyz",
@@ -41,13 +50,18 @@ DEFAULT_CONFIG = {
     "atomic_filters": None,
     "min_distance": {"on": 0, "threshold": None},  # 最小原子间距筛选
     "stress_unit": "GPa",
-    "show_summary": True
-}
+    "show_summary": True,
+    "nproc": 1  # 多个输入文件时并行筛选的进程数
+})
+
+# TB.dat 每行第一个数（loadtxt 无法读取时使用）和 OUTCAR 中的温度行，模块加载时编译一次
+TB_TEMPERATURE_RE = re.compile(rb"^[^\d.\n]*([\d.]+)", re.M)
+OUTCAR_TEMPERATURE_RE = re.compile(rb"kin\. lattice\s+EKIN_LAT=.*\(temperature\s+([\d\.]+)\s+K\)")
 
 def create_default_config(file_name="txyz.json"):
     """生成默认的 JSON 配置文件"""
     with open(file_name, "w") as f:
-        json.dump(DEFAULT_CONFIG, f, indent=4)
+        dump_json(dict(DEFAULT_CONFIG), f)
     print(f"Default configuration created: {file_name}")
 
 def load_or_create_config(file_name="txyz.json"):
@@ -57,109 +71,154 @@ def load_or_create_config(file_name="txyz.json"):
         print("JSON configuration file not found. Generated a default configuration. Exiting now.")
         exit(0)
     with open(file_name, "r") as f:
-        return json.load(f)
+        return load_json(f)
 
 
+# 超过该原子数时最小距离改用 Gram 矩阵恒等式（一次矩阵乘法）计算
+GRAM_MIN_ATOMS = 200
+# 超过该原子数时改用 KD 树查找最近邻，复杂度为 O(N log N)
+KDTREE_MIN_ATOMS = 500
+
 # 计算最小原子间距及其原子对
 def calculate_min_distance(atoms):
     positions = atoms.get_positions()
     n_atoms = len(positions)
-    min_distance = float("inf")
-    min_pair = None
-    for i in range(n_atoms):
-        for j in range(i + 1, n_atoms):
-            distance = np.linalg.norm(positions[i] - positions[j])
-            if distance < min_distance:
-                min_distance = distance
-                min_pair = (i + 1, j + 1)  # 原子编号从 1 开始
-    return min_distance, min_pair
-
-
-
-
-# 从文件中提取温度
+    if n_atoms < 2:
+        return float("inf"), None
+    if n_atoms > KDTREE_MIN_ATOMS:
+        # 每个原子查询最近的 2 个点（第一个是自身），与逐对扫描一样不考虑周期性边界
+        distances, neighbors = cKDTree(positions).query(positions, k=2)
+        i = int(distances[:, 1].argmin())
+        j = int(neighbors[i, 1] if neighbors[i, 1] != i else neighbors[i, 0])  # 坐标重合时自身可能排在第二位
+        i, j = min(i, j), max(i, j)
+        return np.linalg.norm(positions[i] - positions[j]), (i + 1, j + 1)
+    if n_atoms > GRAM_MIN_ATOMS:
+        # D² = |x_i|² + |x_j|² - 2 x_i·x_j，只在上三角 (i < j) 中找最小值
+        sq = np.einsum("ij,ij->i", positions, positions)
+        d2 = sq[:, None] + sq[None, :] - 2.0 * (positions @ positions.T)
+        d2[np.tril_indices(n_atoms)] = np.inf
+        i, j = divmod(int(d2.argmin()), n_atoms)
+        # 恒等式有舍入误差，选出的原子对再直接计算一次距离
+        return np.linalg.norm(positions[i] - positions[j]), (i + 1, j + 1)
+    # 压缩形式的两两距离平方（i < j 按行展开），不生成 N×N 方阵，只对最小值开方
+    distances2 = pdist(positions, "sqeuclidean")
+    k = int(distances2.argmin())  # 并列时取第一个，与逐对扫描的结果一致
+    # 由压缩下标 k 反推原子对 (i, j)
+    i = n_atoms - 2 - int(np.floor(np.sqrt(-8 * k + 4 * n_atoms * (n_atoms - 1) - 7) / 2.0 - 0.5))
+    j = k + i + 1 - n_atoms * (n_atoms - 1) // 2 + (n_atoms - i) * (n_atoms - i - 1) // 2
+    return np.sqrt(distances2[k]), (i + 1, j + 1)  # 原子编号从 1 开始
+
+
+
+
+# 从文件中提取温度：整个文件内存映射后用编译好的正则一次扫描（pattern 为编译好的 bytes 正则）
 def extract_temperatures_from_file(file_path, pattern):
-    temperatures = []
-    if os.path.exists(file_path):
-        with open(file_path, "r") as file:
-            for line in file:
-                match = re.search(pattern, line)
-                if match:
-                    temperatures.append(float(match.group(1)))
-    return temperatures
-
-# 获取温度信息
-def get_temperatures(tb_path, outcar_path, n_frames):
-    tb_pattern = r"([\d\.]+)"  # TB.dat 格式：每行一个温度值
-    outcar_pattern = r"kin\. lattice\s+EKIN_LAT=.*\(temperature\s+([\d\.]+)\s+K\)"  # OUTCAR 格式
-
-    temperatures = extract_temperatures_from_file(tb_path, tb_pattern)
-    if not temperatures:
-        temperatures = extract_temperatures_from_file(outcar_path, outcar_pattern)
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return []  # 空文件无法 mmap
+    with open(file_path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return [float(match.group(1)) for match in pattern.finditer(mm)]
+
+# 从 TB.dat 提取温度：每行一个温度值，优先用 np.loadtxt 读取，格式不规整时退回正则逐行取第一个数
+def extract_temperatures_from_tb(tb_path):
+    if not os.path.exists(tb_path) or os.path.getsize(tb_path) == 0:
+        return []
+    try:
+        return np.loadtxt(tb_path, usecols=0, ndmin=1).tolist()
+    except ValueError:
+        return extract_temperatures_from_file(tb_path, TB_TEMPERATURE_RE)
+
+# 获取温度信息（都不存在时返回空列表，各帧温度按 0.0 处理）
+def get_temperatures(tb_path, outcar_path):
+    temperatures = extract_temperatures_from_tb(tb_path)
     if not temperatures:
-        temperatures = [0.0] * n_frames
+        temperatures = extract_temperatures_from_file(outcar_path, OUTCAR_TEMPERATURE_RE)
     return temperatures
 
-# 从 ST.dat 提取应力
+# ST.dat / OUTCAR 中应力列 (XX, YY, ZZ, XY, YZ, ZX) 到 fstress 顺序 (XX, YY, ZZ, YZ, XZ, XY) 的重排
+STRESS_COLUMN_ORDER = [0, 1, 2, 4, 5, 3]
+
+# 从 ST.dat 提取应力，返回 (N, 6) 数组（单位为 GPa）
 def extract_stress_from_file(file_path):
-    stresses = []
-    if os.path.exists(file_path):
+    if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        return np.empty((0, 6))
+    try:
+        data = np.loadtxt(file_path, usecols=(1, 2, 3, 4, 5, 6), ndmin=2)
+    except ValueError:
+        # 格式不规整时逐行解析，跳过列数不足或无法转换的行；数值收集到一个扁平列表，最后一次转换为数组
+        values = []
         with open(file_path, "r") as file:
             for line in file:
                 tokens = line.split()
                 if len(tokens) >= 7:
                     try:
-                        stress_values = list(map(float, tokens[1:7]))
-                        reordered_stress = [
-                            stress_values[0],  # XX
-                            stress_values[1],  # YY
-                            stress_values[2],  # ZZ
-                            stress_values[4],  # YZ
-                            stress_values[5],  # XZ
-                            stress_values[3],  # XY
-                        ]
-                        stresses.append(np.array(reordered_stress))  # 单位为 GPa
+                        row = [float(t) for t in tokens[1:7]]
                     except ValueError:
                         continue
-    return stresses
+                    values.extend(row)
+        data = np.asarray(values, dtype=np.float64).reshape(-1, 6)
+    return data[:, STRESS_COLUMN_ORDER]
 
-# 从 OUTCAR 提取应力
+# 从 OUTCAR 提取应力，返回 (N, 6) 数组（kB 转换为 GPa）
 def extract_fstress_from_outcar(outcar_path):
-    stresses = []
-    if os.path.exists(outcar_path):
-        with open(outcar_path, "r") as f:
-            for line in f:
-                if "Total+kin." in line:
-                    stress_values = list(map(float, line.split()[1:7]))
-                    reordered_stress = [
-                        stress_values[0],  # XX
-                        stress_values[1],  # YY
-                        stress_values[2],  # ZZ
-                        stress_values[4],  # YZ
-                        stress_values[5],  # XZ
-                        stress_values[3],  # XY
-                    ]
-                    stresses.append(np.array(reordered_stress) / 10.0)  # 转换为 GPa
-    return stresses
-
-# 获取应力信息
-def get_fstress(st_path, outcar_path, atoms_list):
+    if not os.path.exists(outcar_path):
+        return np.empty((0, 6))
+    with open(outcar_path, "r") as f:
+        lines = [line for line in f if "Total+kin." in line]
+    if not lines:
+        return np.empty((0, 6))
+    data = np.loadtxt(lines, usecols=(1, 2, 3, 4, 5, 6), ndmin=2)
+    return data[:, STRESS_COLUMN_ORDER] / 10.0
+
+# 获取应力信息（ST.dat 和 OUTCAR 都不存在时返回 None，由 filter_atoms 逐帧从 atoms 计算）
+def get_fstress(st_path, outcar_path):
     if os.path.exists(st_path):
-        stresses = extract_stress_from_file(st_path)
-    elif os.path.exists(outcar_path):
-        stresses = extract_fstress_from_outcar(outcar_path)
-    else:
-        stresses = [
-            atoms.get_stress(voigt=True) * -EV_A3_TO_GPA for atoms in atoms_list
-        ]
-    return stresses
+        return extract_stress_from_file(st_path)
+    if os.path.exists(outcar_path):
+        return extract_fstress_from_outcar(outcar_path)
+    return None
+
+# 应力和 virial 分量顺序（与 fstress 一致）
+STRESS_KEYS = ["S_xx", "S_yy", "S_zz", "S_yz", "S_xz", "S_xy"]
+VIRIAL_KEYS = ["V_xx", "V_yy", "V_zz", "V_yz", "V_xz", "V_xy"]
+
+# 将 {分量: [下限, 上限]} 转换为上下限数组，未设置的分量用 ±inf 代替
+def filter_bounds(filters, keys):
+    lower = np.full(len(keys), -np.inf)
+    upper = np.full(len(keys), np.inf)
+    for idx, key in enumerate(keys):
+        lo, hi = (filters or {}).get(key, [None, None])
+        if lo is not None:
+            lower[idx] = lo
+        if hi is not None:
+            upper[idx] = hi
+    return lower, upper
+
+# values 中落在 [下限, 上限] 内的元素（None 表示不限），与逐个比较的判断方式一致
+def range_mask(values, value_range):
+    lower, upper = value_range
+    keep = np.ones(len(values), dtype=bool)
+    if lower is not None:
+        keep &= ~(values < lower)
+    if upper is not None:
+        keep &= ~(values > upper)
+    return keep
 
 # 计算压力 (GPa)
 def calculate_pressure(stress):
-    return np.mean(stress[:3])  # 压力为主应力的平均值
+    return (stress[0] + stress[1] + stress[2]) / 3.0  # 压力为主应力的平均值（三个标量直接相加，不经过 np.mean）
+
+# 由 skip 和 frame_range 得到需要读入的帧区间，区间外的帧在读取时就直接跳过
+def frame_slice(config):
+    skip_count = config["skip"]["count"] if config["skip"].get("on", 0) else 0
+    first, last = config["frame_range"]
+    start = max(skip_count, first or 0)
+    stop = max(last + 1, 0) if last is not None else None  # frame_range 的上限包含在内
+    return slice(start, stop)
 
 # 筛选并添加温度、压力、体积、应力和 virial 信息
-def filter_atoms(atoms_list, stresses, temperatures, config):
+# frames 可以是任意可迭代对象（如 iread 的生成器），第一帧的编号为 first_index，
+# 符合条件的帧逐个 yield，实际读入（解析）的帧数记录在 stats["frames_read"] 中
+def filter_atoms(frames, stresses, temperatures, config, stats=None, first_index=0):
     skip_count = config["skip"]["count"] if config["skip"].get("on", 0) else 0
     frame_range = config["frame_range"]
     energy_range = config["energy_range"]
@@ -167,15 +226,46 @@ def filter_atoms(atoms_list, stresses, temperatures, config):
     pressure_range = config["pressure_range"]
     volume_range = config["volume_range"]
     temperature_range = config["temperature_range"]
-    virial_filters = config["virial_filters"]
+    # virial 筛选的上下限同样预先转换为数组；未设置任何上下限时不计算 virial
+    virial_lower, virial_upper = filter_bounds(config["virial_filters"], VIRIAL_KEYS)
+    need_virial = any(bound is not None for bounds in config["virial_filters"].values() for bound in bounds)
+    # 应力筛选的上下限在循环外预先转换为数组，循环内一次比较 6 个分量
+    stress_lower, stress_upper = filter_bounds(config.get("stress_filters"), STRESS_KEYS)
+    # 未设置能量/力筛选时不调用 get_potential_energy/get_forces
+    need_energy = energy_range[0] is not None or energy_range[1] is not None
+    need_force = max_atomic_force_range[0] is not None or max_atomic_force_range[1] is not None
+    # 力筛选按最大原子力范数 |F|，上下限预先平方，循环内不开方（负的上限使所有帧都被排除）
+    force_lower, force_upper = max_atomic_force_range
+    force_lower2 = max(force_lower, 0.0) ** 2 if force_lower is not None else None
+    force_upper2 = (force_upper ** 2 if force_upper >= 0 else -1.0) if force_upper is not None else None
     #最小原子距离筛选
     min_distance_config = config["min_distance"]
     min_distance_on = min_distance_config["on"]
     min_distance_threshold = min_distance_config["threshold"]
 
-    filtered_atoms = []
+    # 温度、应力和压力来自 TB.dat/ST.dat/OUTCAR，循环前一次向量化算出各帧是否通过
+    temperature_keep = range_mask(np.asarray(temperatures, dtype=float), temperature_range)
+    default_temperature_keep = bool(range_mask(np.zeros(1), temperature_range)[0])  # 没有温度来源时按 0.0 K
+    if stresses is not None:
+        stress_array = np.asarray(stresses, dtype=float).reshape(-1, 6)
+        pressures = stress_array[:, :3].mean(axis=1)
+        stress_keep = range_mask(pressures, pressure_range) & ~(
+            (stress_array < stress_lower) | (stress_array > stress_upper)
+        ).any(axis=1)
+    else:
+        stress_keep = np.zeros(0, dtype=bool)
+    # 这些来自文件的量写入 info 时的字符串也在循环前一次批量格式化
+    temperature_strs = np.char.mod("%.2f", np.asarray(temperatures, dtype=float))
+    if stresses is not None:
+        pressure_strs = np.char.mod("%.4f", pressures)
+        stress_strs = np.char.mod("%.4f", stress_array)
+
+    if stats is not None:
+        stats["frames_read"] = 0
     min_distance_violations = []
-    for i, atoms in enumerate(atoms_list):
+    for i, atoms in enumerate(frames, start=first_index):
+        if stats is not None:
+            stats["frames_read"] += 1
         if i < skip_count:
             continue
 
@@ -184,17 +274,51 @@ def filter_atoms(atoms_list, stresses, temperatures, config):
         if frame_range[1] is not None and i > frame_range[1]:
             continue
 
-        energy = atoms.get_potential_energy()
-        if energy_range[0] is not None and energy < energy_range[0]:
-            continue
-        if energy_range[1] is not None and energy > energy_range[1]:
-            continue
+        # 筛选按代价从低到高进行：先用文件中已有的温度和应力，再取能量、体积，
+        # 最后才计算 O(N) 的力范数和 O(N²) 的最小距离
+        if i < len(temperatures):
+            if not temperature_keep[i]:
+                continue
+            temperature_str = temperature_strs[i]
+        elif len(temperatures) > 0:
+            # TB.dat/OUTCAR 比轨迹短时不能用默认温度代替，否则会写入错误的温度
+            raise ValueError(
+                f"Temperature source has only {len(temperatures)} entries, "
+                f"but the trajectory has at least {i + 1} frames"
+            )
+        else:
+            # 没有任何温度来源时所有帧按 0.0 K
+            if not default_temperature_keep:
+                continue
+            temperature_str = "0.00"
 
-        max_force = atoms.get_forces().max()
-        if max_atomic_force_range[0] is not None and max_force < max_atomic_force_range[0]:
-            continue
-        if max_atomic_force_range[1] is not None and max_force > max_atomic_force_range[1]:
-            continue
+        if i < len(stress_keep):
+            if not stress_keep[i]:
+                continue
+            stress = stresses[i]
+            pressure_str = pressure_strs[i]
+            fstress_str = ", ".join(stress_strs[i])
+        else:
+            # 文件中没有这一帧的应力：从 atoms 计算，或（文件帧数不足时）不做应力相关筛选
+            stress = atoms.get_stress(voigt=True) * -EV_A3_TO_GPA if stresses is None else None
+            pressure = calculate_pressure(stress) if stress is not None else None
+            if pressure_range[0] is not None and pressure < pressure_range[0]:
+                continue
+            if pressure_range[1] is not None and pressure > pressure_range[1]:
+                continue
+
+            # 按应力分量筛选 (GPa)
+            if stress is not None and ((stress < stress_lower).any() or (stress > stress_upper).any()):
+                continue
+            pressure_str = f"{pressure:.4f}" if pressure is not None else "N/A"
+            fstress_str = ", ".join(f"{s:.4f}" for s in stress) if stress is not None else None
+
+        if need_energy:
+            energy = atoms.get_potential_energy()
+            if energy_range[0] is not None and energy < energy_range[0]:
+                continue
+            if energy_range[1] is not None and energy > energy_range[1]:
+                continue
 
         volume = atoms.get_volume()
         if volume_range[0] is not None and volume < volume_range[0]:
@@ -202,33 +326,18 @@ def filter_atoms(atoms_list, stresses, temperatures, config):
         if volume_range[1] is not None and volume > volume_range[1]:
             continue
 
-        stress = stresses[i] if stresses and i < len(stresses) else None
-        pressure = calculate_pressure(stress) if stress is not None else None
-        if pressure_range[0] is not None and pressure < pressure_range[0]:
-            continue
-        if pressure_range[1] is not None and pressure > pressure_range[1]:
-            continue
-
-        temperature = temperatures[i]
-        if temperature_range[0] is not None and temperature < temperature_range[0]:
-            continue
-        if temperature_range[1] is not None and temperature > temperature_range[1]:
-            continue
+        # 按 virial 筛选（virial 只用于筛选，未设置 virial 上下限时不计算）
+        if need_virial and stress is not None:
+            virial = -stress * volume
+            if ((virial < virial_lower) | (virial > virial_upper)).any():
+                continue
 
-        # 按 virial 筛选
-        virial = -stress * volume if stress is not None else None
-        if virial is not None:
-            virial_filters_passed = True
-            for key, (lower, upper) in virial_filters.items():
-                idx = ["V_xx", "V_yy", "V_zz", "V_yz", "V_xz", "V_xy"].index(key)
-                value = virial[idx]
-                if lower is not None and value < lower:
-                    virial_filters_passed = False
-                    break
-                if upper is not None and value > upper:
-                    virial_filters_passed = False
-                    break
-            if not virial_filters_passed:
+        if need_force:
+            forces = atoms.get_forces()
+            max_force2 = np.einsum("ij,ij->i", forces, forces).max()
+            if force_lower2 is not None and max_force2 < force_lower2:
+                continue
+            if force_upper2 is not None and max_force2 > force_upper2:
                 continue
 
         if min_distance_on:
@@ -240,18 +349,55 @@ def filter_atoms(atoms_list, stresses, temperatures, config):
             atoms.info["min_pair"] = f"{min_pair[0]}-{min_pair[1]}"
 
 
-        atoms.info["temperature"] = f"{temperature:.2f}"
+        atoms.info["temperature"] = temperature_str
         atoms.info["volume"] = f"{volume:.4f}"
-        atoms.info["pressure"] = f"{pressure:.4f}" if pressure is not None else "N/A"
+        atoms.info["pressure"] = pressure_str
         if stress is not None:
-            atoms.info["fstress"] = ", ".join(f"{s:.4f}" for s in stress)
+            atoms.info["fstress"] = fstress_str
+
+
+
 
+        yield atoms
 
+# 逐帧读取输入文件；读取出错时报告并停止读取该文件，已读出的帧照常处理。
+# 只捕获读取本身的异常，筛选和写出时的错误照常抛出
+def read_frames(input_file, input_format, index):
+    try:
+        for atoms in iread(input_file, index=index, format=input_format):
+            yield atoms
+    except Exception as e:
+        print(f"Error reading file {input_file} with format {input_format}: {e}")
 
+# 读取并筛选一个输入文件，符合条件的帧逐个交给 sink；返回 (读入帧数, 符合条件的帧数)
+def process_file(input_file, input_format, config, sink):
+    print(f"Reading frames from {input_file} with format {input_format}...")
+    tb_path = os.path.join(os.path.dirname(input_file), "TB.dat")
+    outcar_path = os.path.join(os.path.dirname(input_file), "OUTCAR")
+    st_path = os.path.join(os.path.dirname(input_file), "ST.dat")
 
-        filtered_atoms.append(atoms)
+    temperatures = get_temperatures(tb_path, outcar_path)
+    stresses = get_fstress(st_path, outcar_path)
 
-    return filtered_atoms, skip_count
+    print(f"Filtering frames from {input_file}...")
+    stats = {"frames_read": 0}
+    n_kept = 0
+    # 跳过的帧和 frame_range 之外的帧不解析
+    index = frame_slice(config)
+    frames = read_frames(input_file, input_format, index)
+    for atoms in filter_atoms(frames, stresses, temperatures, config, stats, index.start):
+        sink(atoms)
+        n_kept += 1
+    return stats["frames_read"], n_kept
+
+# 在子进程中筛选一个输入文件，返回 (符合条件的帧列表, 读入帧数)
+def collect_file(input_file, input_format, config):
+    kept = []
+    n_frames, _ = process_file(input_file, input_format, config, kept.append)
+    return kept, n_frames
+
+# 可以逐帧追加到同一输出流的格式；其他格式（如 traj、json）只能一次写出全部帧
+STREAM_FORMATS = ("extxyz", "xyz")
 
 # 主函数
 def main():
@@ -270,7 +416,7 @@ def main():
                     "  - frame_range         Range of frames to process (e.g., [0, 1000]).\n"
                     "  - energy_range        Filter frames by energy range (e.g., [-10.0, 10.0]).\n"
                     "  - max_atomic_force_range\n"
-                    "                        Filter frames by maximum atomic force (e.g., [0.0, 5.0]).\n"
+                    "                        Filter frames by maximum atomic force norm |F| in eV/Å (e.g., [0.0, 5.0]).\n"
                     "  - pressure_range      Filter frames by pressure in GPa (e.g., [0.0, 10.0]).\n"
                     "  - volume_range        Filter frames by volume in Å³ (e.g., [100.0, 1000.0]).\n"
                     "  - temperature_range   Filter frames by temperature in K (e.g., [300.0, 1000.0]).\n"
@@ -278,7 +424,8 @@ def main():
                     "  - stress_filters      Apply filters on stress components (e.g., {\"S_xx\": [None, None]}).\n"
                     "  - atomic_filters      Apply custom atomic filters (e.g., {\"species\": [\"H\", \"O\"]}).\n"
                     "  - stress_unit         Unit of stress values (default: \"GPa\").\n"
-                    "  - show_summary        Display a summary of filtering results (default: true).\n\n"
+                    "  - show_summary        Display a summary of filtering results (default: true).\n"
+                    "  - nproc               Number of processes used to filter several input files in parallel (default: 1).\n\n"
                     "Example:\n"
                     "  python txyz.py -c txyz.json",
         formatter_class=argparse.RawTextHelpFormatter
@@ -307,37 +454,48 @@ def main():
         print(f"Error: No input files found matching patterns: {input_files}")
         return
 
-    filtered_atoms_total = []
-    total_frames = 0
-    for input_file in all_files:
-        print(f"Reading frames from {input_file} with format {input_format}...")
-        try:
-            atoms_list = read(input_file, index=":", format=input_format)
-        except Exception as e:
-            print(f"Error reading file {input_file} with format {input_format}: {e}")
-            continue
-
-        total_frames += len(atoms_list)
-
-        tb_path = os.path.join(os.path.dirname(input_file), "TB.dat")
-        outcar_path = os.path.join(os.path.dirname(input_file), "OUTCAR")
-        st_path = os.path.join(os.path.dirname(input_file), "ST.dat")
-
-        temperatures = get_temperatures(tb_path, outcar_path, len(atoms_list))
-        stresses = get_fstress(st_path, outcar_path, atoms_list)
-
-        print(f"Filtering frames from {input_file}...")
-        filtered_atoms, skip_count = filter_atoms(atoms_list, stresses, temperatures, config)
-        filtered_atoms_total.extend(filtered_atoms)
-
-    write(output_file, filtered_atoms_total)
-    print(f"Filtered {len(filtered_atoms_total)} frames saved to {output_file}")
+    skip_count = config["skip"]["count"] if config["skip"].get("on", 0) else 0
+    nproc = config.get("nproc", 1)
+    n_filtered = 0
+    frames_read = 0
+    # 可逐帧写出的格式只打开一次输出文件，符合条件的结构按输入文件顺序逐帧写入同一句柄；
+    # 其他格式（如 traj、json）先收集全部结构，最后一次写出
+    output_format = filetype(output_file, read=False)
+    streaming = output_format in STREAM_FORMATS
+    kept_frames = []
+    # 按格式选择文本/二进制模式，并由 ASE 按扩展名处理 .gz/.bz2/.xz 压缩
+    output_mode = "wb" if get_ioformat(output_format).isbinary else "w"
+    with (open_with_compression(output_file, output_mode) if streaming else nullcontext()) as fh:
+        def sink(atoms):
+            if streaming:
+                write(fh, atoms, format=output_format)
+            else:
+                kept_frames.append(atoms)
+        if nproc > 1 and len(all_files) > 1:
+            # 各输入文件相互独立，分发到多个进程筛选，结果按文件顺序写出
+            with ProcessPoolExecutor(max_workers=nproc) as executor:
+                results = executor.map(collect_file, all_files, repeat(input_format), repeat(config))
+                for kept, n_frames in results:
+                    for atoms in kept:
+                        sink(atoms)
+                    n_filtered += len(kept)
+                    frames_read += n_frames
+        else:
+            # 单进程时逐帧流式读取、筛选并写出
+            for input_file in all_files:
+                n_frames, n_kept = process_file(input_file, input_format, config, sink)
+                n_filtered += n_kept
+                frames_read += n_frames
+    if not streaming:
+        write(output_file, kept_frames, format=output_format)
+
+    print(f"Filtered {n_filtered} frames saved to {output_file}")
 
     if config["show_summary"]:
         print(f"\nSummary:")
-        print(f"  Total frames: {total_frames}")
+        print(f"  Frames read: {frames_read}")
         print(f"  Skipped frames: {skip_count}")
-        print(f"  Filtered frames: {len(filtered_atoms_total)}")
+        print(f"  Filtered frames: {n_filtered}")
 
 
 if __name__ == "__main__":
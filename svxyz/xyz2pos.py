@@ -1,7 +1,13 @@
 import os
 import sys
-import json
+from io import StringIO
+from itertools import islice
+import numpy as np
 from ase.io import read, write
+from ase.io.formats import filetype
+
+from svxyz.jsonio import dump_json, load_json
+from svxyz.xyzscan import frame_headers, file_signature
 
 # 配置文件路径
 CONFIG_FILE = "./xyz2pos.json"
@@ -32,7 +38,7 @@ DEFAULT_CONFIG = {
 def create_default_config():
     """生成默认的 JSON 配置文件"""
     with open(CONFIG_FILE, "w") as f:
-        json.dump(DEFAULT_CONFIG, f, indent=4)
+        dump_json(DEFAULT_CONFIG, f)
     print(f"Default configuration created: {CONFIG_FILE}")
 
 def load_or_create_config():
@@ -40,12 +46,12 @@ def load_or_create_config():
     if not os.path.exists(CONFIG_FILE):
         return None
     with open(CONFIG_FILE, "r") as f:
-        return json.load(f)
+        return load_json(f)
 
 def update_config(config):
     """更新配置文件"""
     with open(CONFIG_FILE, "w") as f:
-        json.dump(config, f, indent=4)
+        dump_json(config, f)
 
 def show_help():
     """显示帮助信息"""
@@ -96,6 +102,45 @@ def parse_arguments(args, config):
 
     update_config(config)
 
+def _xyz_index_path(path):
+    """帧偏移索引文件路径"""
+    return f"{path}.idx.npy"
+
+def _xyz_signature(path):
+    """索引中保存的 XYZ 文件签名 (mtime_ns, 大小)"""
+    return np.array(file_signature(path), dtype=np.int64)
+
+def _xyz_build_index(path):
+    """扫描 XYZ 文件得到每帧的 (字节偏移, 原子数)，并连同文件签名保存到索引文件"""
+    signature = _xyz_signature(path)
+    index = np.array(frame_headers(path), dtype=np.int64).reshape(-1, 2)
+    try:
+        # 第 0 行保存文件签名，之后每行为一帧
+        np.save(_xyz_index_path(path), np.vstack([signature, index]))
+    except OSError as e:
+        print(f"Warning: failed to write frame index {_xyz_index_path(path)}: {e}")
+    return index
+
+def _xyz_load_index(path):
+    """读取帧偏移索引；索引不存在或签名 (mtime, 大小) 与 XYZ 文件不一致时重新生成"""
+    index_file = _xyz_index_path(path)
+    if os.path.exists(index_file):
+        try:
+            stored = np.load(index_file)
+            if stored.ndim == 2 and len(stored) > 0 and np.array_equal(stored[0], _xyz_signature(path)):
+                return stored[1:]
+        except (OSError, ValueError):
+            pass  # 索引损坏时重新生成
+    return _xyz_build_index(path)
+
+def read_xyz_frame(path, frame_index, input_format=None):
+    """借助帧偏移索引直接定位并读取 XYZ 文件中的一帧"""
+    offset, n_atoms = _xyz_load_index(path)[frame_index]
+    with open(path, "rb") as f:
+        f.seek(offset)
+        text = b"".join(islice(f, n_atoms + 2)).decode()
+    return read(StringIO(text), index=0, format=input_format or filetype(path))
+
 def main():
     """主函数"""
     args = sys.argv[1:]
@@ -129,7 +174,10 @@ def main():
 
     print(f"Reading file: {input_file}")
     try:
-        if input_format:
+        # XYZ 没有帧索引，按帧号读取需要从头扫描；第一次读取时生成偏移索引，之后直接定位
+        if (input_format or filetype(input_file)) in ("xyz", "extxyz"):
+            atoms = read_xyz_frame(input_file, frame_index, input_format)
+        elif input_format:
             atoms = read(input_file, index=frame_index, format=input_format)
         else:
             atoms = read(input_file, index=frame_index)
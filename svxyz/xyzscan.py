@@ -0,0 +1,26 @@
+import os
+from itertools import islice
+
+def frame_headers(xyz_file):
+    """
+    顺序扫描一遍 XYZ 文件，找出每帧起始行（原子数行）的字节偏移和原子数。
+
+    Returns:
+        list: 每帧一个 (字节偏移, 原子数) 元组；帧之间的空行被跳过。
+    """
+    headers = []
+    with open(xyz_file, "rb") as f:
+        offset = 0
+        for line in f:
+            if not line.strip():
+                offset += len(line)
+                continue
+            n_atoms = int(line)
+            headers.append((offset, n_atoms))
+            offset += len(line) + sum(len(l) for l in islice(f, n_atoms + 1))
+    return headers
+
+def file_signature(path):
+    """用修改时间 (ns) 和文件大小标识文件的当前版本，供旁路缓存/索引判断是否过期"""
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size